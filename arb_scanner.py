@@ -0,0 +1,123 @@
+# arb_scanner.py — cross-book sure-bets (h2h, totals) and middles (adjacent totals lines) over fetch_soccer_odds()
+from __future__ import annotations
+import os, numpy as np, pandas as pd, pytz
+from itertools import groupby
+
+N_OUTCOMES = {"h2h": 3, "totals": 2}
+OUTCOME_ORDER = {"home": 0, "draw": 1, "away": 2, "over": 0, "under": 1}
+
+def best_prices(df_all: pd.DataFrame) -> pd.DataFrame:
+    """Best price and book per (match, market, line, outcome) in one sort + drop_duplicates pass."""
+    df = df_all[((df_all["market"]=="h2h") & df_all["outcome"].isin(["home","draw","away"])) |
+                ((df_all["market"]=="totals") & df_all["outcome"].isin(["over","under"]))]
+    df = df[df["price"] > 1.0].copy()
+    df["line"] = pd.to_numeric(df["point"], errors="coerce").round(2).where(df["market"]=="totals", -1.0)
+    df = df.dropna(subset=["line"]).sort_values("price", ascending=False, kind="stable")
+    return df.drop_duplicates(["match_id","market","line","outcome"]).reset_index(drop=True)
+
+def _stake_splits(prices, total: float):
+    inv = 1.0 / np.asarray(prices, dtype=float); return total * inv / inv.sum()
+
+def find_arbs(df_all: pd.DataFrame, total_stake: float = 100.0, min_profit: float = 0.0, best: pd.DataFrame | None = None) -> list:
+    """Sure-bets: complete outcome sets whose best prices imply sum(1/price) < 1."""
+    best = best_prices(df_all) if best is None else best
+    if best.empty: return []
+    best = best.assign(inv=1.0 / best["price"])
+    g = best.groupby(["match_id","market","line"], sort=False)
+    best["inv_sum"] = g["inv"].transform("sum"); best["n_out"] = g["inv"].transform("size")
+    hits = best[(best["n_out"] == best["market"].map(N_OUTCOMES)) & (1.0 / best["inv_sum"] - 1.0 > min_profit)]
+    hits = hits.assign(stake=total_stake * hits["inv"] / hits["inv_sum"], order=hits["outcome"].map(OUTCOME_ORDER))
+    hits = hits.sort_values(["match_id","market","line","order"], kind="stable")
+    out = []
+    for (mid, market, line), legs in groupby(hits.to_dict("records"), key=lambda r: (r["match_id"], r["market"], r["line"])):
+        legs = list(legs); r = legs[0]
+        out.append({"kind": "arb", "match_id": mid, "league": r["league"], "teams": r["teams"], "start_time_iso": r["start_time_iso"],
+                    "market": market, "line": None if market == "h2h" else float(line), "profit": float(1.0 / r["inv_sum"] - 1.0),
+                    "total_stake": float(total_stake),
+                    "legs": [{"outcome": l["outcome"], "price": float(l["price"]), "book": l["book"], "stake": float(l["stake"])} for l in legs]})
+    return sorted(out, key=lambda a: a["profit"], reverse=True)
+
+def find_middles(df_all: pd.DataFrame, total_stake: float = 100.0, max_cost: float = 0.02, best: pd.DataFrame | None = None) -> list:
+    """Middles: Over at one totals line + Under at the next line up (e.g. O2.5 / U3.5 both win on 3 goals).
+    Kept when the worst case (only one leg wins) loses at most `max_cost` of the total stake."""
+    best = best_prices(df_all) if best is None else best
+    tot = best[best["market"]=="totals"]
+    if tot.empty: return []
+    wide = tot.pivot_table(index=["match_id","line"], columns="outcome", values=["price","book"], aggfunc="first")
+    wide.columns = [f"{v}_{o}" for v, o in wide.columns]; wide = wide.reset_index().sort_values(["match_id","line"])
+    for c in ("price_over","price_under","book_over","book_under"):
+        if c not in wide.columns: wide[c] = np.nan
+    nxt = wide.groupby("match_id", sort=False)[["line","price_under","book_under"]].shift(-1)
+    wide["next_line"], wide["next_under"], wide["next_book"] = nxt["line"], nxt["price_under"], nxt["book_under"]
+    wide["inv_sum"] = 1.0 / wide["price_over"] + 1.0 / wide["next_under"]
+    # at least one whole number of goals strictly between the two lines
+    gap = np.floor(wide["next_line"] - 1e-9) > wide["line"]
+    hits = wide[gap & wide["inv_sum"].notna() & (1.0 - wide["inv_sum"] >= -max_cost * wide["inv_sum"])]
+    if hits.empty: return []
+    info = best.drop_duplicates("match_id").set_index("match_id")[["league","teams","start_time_iso"]]
+    out = []
+    for r in hits.itertuples(index=False):
+        s_over, s_under = _stake_splits([r.price_over, r.next_under], total_stake); m = info.loc[r.match_id]
+        one_leg = total_stake / r.inv_sum
+        out.append({"kind": "middle", "match_id": r.match_id, "league": m["league"], "teams": m["teams"], "start_time_iso": m["start_time_iso"],
+                    "market": "totals", "line": float(r.line), "next_line": float(r.next_line),
+                    "profit": float(one_leg / total_stake - 1.0), "middle_profit": float(2 * one_leg / total_stake - 1.0),
+                    "total_stake": float(total_stake),
+                    "legs": [{"outcome": f"over {r.line:g}", "price": float(r.price_over), "book": r.book_over, "stake": float(s_over)},
+                             {"outcome": f"under {r.next_line:g}", "price": float(r.next_under), "book": r.next_book, "stake": float(s_under)}]})
+    return sorted(out, key=lambda a: (a["profit"], a["middle_profit"]), reverse=True)
+
+def scan(df_all: pd.DataFrame, total_stake: float = 100.0, min_profit: float = 0.0, max_cost: float = 0.02):
+    best = best_prices(df_all)
+    return find_arbs(df_all, total_stake, min_profit, best=best), find_middles(df_all, total_stake, max_cost, best=best)
+
+def fmt_arb(a: dict) -> str:
+    mkt = "H2H" if a["market"] == "h2h" else f"Totals {a['line']:g}"
+    if a["kind"] == "middle":
+        mkt = f"Middle {a['line']:g}/{a['next_line']:g}"
+        res = f"📈 Un pari gagne: <b>{a['profit']*100:+.2f}%</b> • Middle: <b>{a['middle_profit']*100:+.1f}%</b>"
+    else:
+        res = f"📈 Profit garanti: <b>{a['profit']*100:.2f}%</b>"
+    legs = "\n".join(f"🎲 {l['outcome'].capitalize()} @ <b>{l['price']:.2f}</b> • {l['book']} → mise <b>{l['stake']:.2f}</b>" for l in a["legs"])
+    return (f"🏟️ <b>{a['league']}</b>\n{a['teams']}\n— — — — —\n"
+            f"✅ <b>{mkt}</b> (mise totale {a['total_stake']:.0f})\n{legs}\n{res}")
+
+def arb_report(df_all: pd.DataFrame) -> str:
+    """Telegram (HTML) report of sure-bets then middles, using ARB_STAKE, ARB_MIN_PROFIT, MIDDLE_MAX_COST, MAX_ARBS."""
+    tz = pytz.timezone(os.getenv("TIMEZONE","Europe/Paris"))
+    if df_all.empty: return "<b>📣 Foot — Arbitrages</b>\nAucun match."
+    arbs, middles = scan(df_all, total_stake=float(os.getenv("ARB_STAKE","100")), min_profit=float(os.getenv("ARB_MIN_PROFIT","0.0")),
+                         max_cost=float(os.getenv("MIDDLE_MAX_COST","0.02")))
+    found = arbs + middles
+    if not found: return "<b>📣 Foot — Arbitrages</b>\nAucun surebet ni middle."
+    parts = ["<b>📣 Foot — Arbitrages</b>"]
+    for a in found[:int(os.getenv("MAX_ARBS","10"))]:
+        start = pd.to_datetime(a["start_time_iso"], utc=True).tz_convert(tz).strftime("%a %d %b • %H:%M")
+        parts.append(fmt_arb(a) + f"\n🕒 {start}")
+    return "\n\n".join(parts)
+
+def _pack(pieces, sep: str, size: int) -> list:
+    chunks, cur = [], ""
+    for p in pieces:
+        if cur and len(cur) + len(sep) + len(p) > size: chunks.append(cur); cur = p
+        else: cur = f"{cur}{sep}{p}" if cur else p
+    if cur: chunks.append(cur)
+    return chunks
+
+def chunk_message(text: str, size: int = 3500) -> list:
+    """Split on blank lines (then on lines for an oversized entry) so no chunk exceeds `size`
+    (Telegram caps messages at 4096). Tags never span lines here, so only a single line longer
+    than `size` — never produced by arb_report — would be hard-cut."""
+    blocks = []
+    for block in text.split("\n\n"):
+        if len(block) <= size: blocks.append(block); continue
+        lines = [ln[i:i+size] for ln in block.split("\n") for i in range(0, max(1, len(ln)), size)]
+        blocks.extend(_pack(lines, "\n", size))
+    return _pack(blocks, "\n\n", size)
+
+def main():
+    from odds_providers import fetch_soccer_odds
+    from cron_send_foot import send_telegram
+    for part in chunk_message(arb_report(fetch_soccer_odds())): send_telegram(part)
+
+if __name__ == "__main__": main()
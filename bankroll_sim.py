@@ -0,0 +1,69 @@
+# bankroll_sim.py — vectorized Monte Carlo of bankroll paths over a sequence of bets
+from __future__ import annotations
+import numpy as np, pandas as pd
+from strategy import fractional_kelly
+
+ODDS_COLS = ["book_odds","price","odds"]
+PROB_COLS = ["blend_prob","adj_prob","consensus_prob","model_prob","prob"]
+
+def _first_col(df: pd.DataFrame, cols):
+    for c in cols:
+        if c in df.columns and df[c].notna().any(): return c
+    return None
+
+def bets_from_journal(df: pd.DataFrame) -> pd.DataFrame:
+    """Bet sequence (odds, prob, stake) from the journal, in time order; rows without odds/prob are dropped."""
+    oc, pc = _first_col(df, ODDS_COLS), _first_col(df, PROB_COLS)
+    if oc is None or pc is None: return pd.DataFrame(columns=["odds","prob","stake"])
+    out = pd.DataFrame({"odds": pd.to_numeric(df[oc], errors="coerce"), "prob": pd.to_numeric(df[pc], errors="coerce"),
+                        "stake": pd.to_numeric(df["stake"], errors="coerce") if "stake" in df.columns else np.nan})
+    if "timestamp_iso" in df.columns: out = out.loc[pd.to_datetime(df["timestamp_iso"], errors="coerce").sort_values(kind="stable").index]
+    out = out[(out["odds"] > 1.0) & out["prob"].between(0.0, 1.0, inclusive="neither")]
+    return out.reset_index(drop=True)
+
+def kelly_fractions(odds, probs, fraction: float = 0.20) -> np.ndarray:
+    """Bankroll fraction per bet from strategy.fractional_kelly (per bet, shared by all paths)."""
+    return np.array([fractional_kelly(p, o, fraction) for o, p in zip(odds, probs)], dtype=np.float64)
+
+def simulate_paths(odds, probs, bk0: float = 100.0, n_paths: int = 100_000, stakes=None, fractions=None,
+                   ruin_frac: float = 0.0, seed: int = 0, max_cells: int = 5_000_000) -> dict:
+    """Simulate n_paths bankroll paths; each bet wins with its model probability.
+    Fixed `stakes` (additive; each stake is capped at the bankroll left and a path stops betting once it
+    hits bk0 * ruin_frac) or Kelly `fractions` of the current bankroll (multiplicative; never reaches 0,
+    so ruin needs ruin_frac > 0).
+    Paths are processed in chunks of ~max_cells array cells to bound memory.
+    Returns per-path final bankroll, max drawdown (fraction of peak), ROI on turnover and a ruin flag."""
+    odds = np.asarray(odds, dtype=np.float64); probs = np.asarray(probs, dtype=np.float64); T = len(odds)
+    rng = np.random.default_rng(seed); ruin_level = bk0 * ruin_frac
+    final = np.empty(n_paths); max_dd = np.empty(n_paths); roi = np.empty(n_paths); ruined = np.empty(n_paths, dtype=bool)
+    if T == 0:
+        final[:] = bk0; max_dd[:] = 0.0; roi[:] = 0.0; ruined[:] = bk0 <= ruin_level
+        return {"final": final, "max_dd": max_dd, "roi": roi, "ruined": ruined}
+    chunk = max(1, max_cells // T)
+    for s in range(0, n_paths, chunk):
+        n = min(chunk, n_paths - s)
+        win = rng.random((n, T)) < probs
+        if fractions is not None:
+            f = np.asarray(fractions, dtype=np.float64)
+            eq = bk0 * np.cumprod(np.where(win, 1.0 + f * (odds - 1.0), 1.0 - f), axis=1)
+            prev = np.concatenate([np.full((n, 1), bk0), eq[:, :-1]], axis=1)
+            staked = (prev * f).sum(axis=1)
+        else:
+            # stakes are capped at the bankroll before each bet, which makes paths sequential in time:
+            # step over bets, vectorized across paths; a path stops betting once it hits ruin_level
+            st = np.asarray(stakes, dtype=np.float64)
+            b = np.full(n, float(bk0)); alive = b > ruin_level; staked = np.zeros(n); eq = np.empty((n, T))
+            for t in range(T):
+                s_t = np.where(alive, np.minimum(st[t], b), 0.0)
+                b = b + np.where(win[:, t], s_t * (odds[t] - 1.0), -s_t)
+                staked += s_t; eq[:, t] = b; alive &= b > ruin_level
+        peak = np.maximum(np.maximum.accumulate(eq, axis=1), bk0)
+        sl = slice(s, s + n)
+        final[sl] = eq[:, -1]; max_dd[sl] = ((peak - eq) / peak).max(axis=1)
+        roi[sl] = (eq[:, -1] - bk0) / np.maximum(staked, 1e-9); ruined[sl] = (eq <= ruin_level).any(axis=1)
+    return {"final": final, "max_dd": max_dd, "roi": roi, "ruined": ruined}
+
+def summarize_paths(sim: dict, bk0: float = 100.0, pcts=(5, 25, 50, 75, 95)) -> dict:
+    return {"risk_of_ruin": float(sim["ruined"].mean()), "p_loss": float((sim["final"] < bk0).mean()),
+            "final": dict(zip(pcts, np.percentile(sim["final"], pcts))), "max_dd": dict(zip(pcts, np.percentile(sim["max_dd"], pcts))),
+            "roi": dict(zip(pcts, np.percentile(sim["roi"], pcts)))}
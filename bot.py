@@ -2,9 +2,12 @@
 import os, time, requests, pandas as pd, pytz
 from odds_providers import fetch_soccer_odds
 from foot_selector import select_picks, weekend_report
-TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN'); API = f'https://api.telegram.org/bot{TOKEN}'
+from foot_ratings import load_ratings
+from arb_scanner import arb_report, chunk_message
+TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN'); API = f"{os.getenv('TELEGRAM_API_BASE','https://api.telegram.org')}/bot{TOKEN}"
 tz = pytz.timezone(os.getenv('TIMEZONE','Europe/Paris'))
 MIN_EV = float(os.getenv('MIN_EV','0.02')); MAX_PICKS = int(os.getenv('MAX_PICKS','3'))
+RATINGS_WEIGHT = float(os.getenv('RATINGS_WEIGHT','0.3'))
 AUTHORIZED = set([s.strip() for s in os.getenv('TELEGRAM_CHAT_ID','').split(',') if s.strip()])
 def send(chat_id, text): requests.post(f'{API}/sendMessage', data={'chat_id': chat_id, 'text': text, 'parse_mode':'HTML'})
 def fmt_pick(p):
@@ -14,7 +17,7 @@ def fmt_pick(p):
 def do_picks(chat_id):
     df = fetch_soccer_odds(); 
     if df.empty: send(chat_id, "<b>📣 Foot — Sélections</b>\nAucun match."); return
-    picks, _ = select_picks(df, min_ev=MIN_EV, max_picks=MAX_PICKS)
+    picks, _ = select_picks(df, min_ev=MIN_EV, max_picks=MAX_PICKS, ratings=load_ratings(), ratings_weight=RATINGS_WEIGHT)
     if not picks: send(chat_id, "<b>📣 Foot — Sélections</b>\nAucun pick ≥ seuil EV."); return
     parts = ["<b>📣 Foot — Sélections</b>"]
     for p in picks:
@@ -26,7 +29,7 @@ def do_weekend(chat_id):
     if df.empty: send(chat_id, "<b>📣 Foot — Rapport week-end</b>\nAucun match."); return
     df['start_dt'] = pd.to_datetime(df['start_time_iso'], utc=True).dt.tz_convert(tz)
     df = df[(df['start_dt'].dt.weekday >= 4) & (df['start_dt'].dt.weekday <= 6)]
-    rep = weekend_report(df, min_ev=float(os.getenv('WEEKEND_MIN_EV','0.01')))
+    rep = weekend_report(df, min_ev=float(os.getenv('WEEKEND_MIN_EV','0.01')), ratings=load_ratings(), ratings_weight=RATINGS_WEIGHT)
     order = ['soccer_france_ligue_1','soccer_epl','soccer_spain_la_liga','soccer_italy_serie_a','soccer_germany_bundesliga']
     msg = "<b>📣 Foot — Rapport week-end (Top-5)</b>"
     for lg in order + [k for k in rep.keys() if k not in order]:
@@ -35,6 +38,8 @@ def do_weekend(chat_id):
         msg += "\n\n<b>"+lg+"</b>\n" + "\n".join(lines)
     # chunk
     for i in range(0, len(msg), 3500): send(chat_id, msg[i:i+3500])
+def do_arbs(chat_id):
+    for part in chunk_message(arb_report(fetch_soccer_odds())): send(chat_id, part)
 def main():
     offset=None
     while True:
@@ -49,8 +54,9 @@ def main():
                 send(chat_id, '⛔️ Accès restreint. Ajoute ce chat_id dans TELEGRAM_CHAT_ID.'); continue
             if text.startswith('/picks') or text.startswith('/today'): do_picks(chat_id)
             elif text.startswith('/weekend'): do_weekend(chat_id)
+            elif text.startswith('/arbs'): do_arbs(chat_id)
             elif text.startswith('/start') or text.startswith('/help'):
-                send(chat_id, "Commandes: /picks, /weekend")
-            else: send(chat_id, "Commande inconnue. Utilise /picks ou /weekend")
+                send(chat_id, "Commandes: /picks, /weekend, /arbs")
+            else: send(chat_id, "Commande inconnue. Utilise /picks, /weekend ou /arbs")
         time.sleep(1)
 if __name__ == '__main__': main()
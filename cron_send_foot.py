@@ -1,9 +1,11 @@
 import os, pandas as pd, pytz, requests
 from odds_providers import fetch_soccer_odds
+from poll_planner import fetch_planned_odds
 from foot_selector import select_picks
+from foot_ratings import load_ratings
 def send_telegram(text: str):
     token = os.environ["TELEGRAM_BOT_TOKEN"]; chat_id = os.environ["TELEGRAM_CHAT_ID"]
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    url = f"{os.getenv('TELEGRAM_API_BASE','https://api.telegram.org')}/bot{token}/sendMessage"
     r = requests.post(url, data={"chat_id": chat_id, "text": text, "parse_mode":"HTML"}, timeout=20)
     r.raise_for_status()
 def fmt_pick(p):
@@ -16,9 +18,10 @@ def fmt_pick(p):
 def main():
     tz = pytz.timezone(os.getenv("TIMEZONE","Europe/Paris"))
     min_ev = float(os.getenv("MIN_EV","0.02")); max_picks = int(os.getenv("MAX_PICKS","3"))
-    df = fetch_soccer_odds()
+    df = fetch_planned_odds() if os.getenv("ODDS_USE_PLANNER") == "1" else fetch_soccer_odds()
     if df.empty: send_telegram("<b>📣 Foot — Sélections</b>\nAucun match trouvé."); return
-    picks, diags = select_picks(df, min_ev=min_ev, max_picks=max_picks)
+    picks, diags = select_picks(df, min_ev=min_ev, max_picks=max_picks,
+                                ratings=load_ratings(), ratings_weight=float(os.getenv("RATINGS_WEIGHT","0.3")))
     if picks:
         parts = ["<b>📣 Foot — Sélections</b>"]
         for p in picks:
@@ -25,8 +25,10 @@ def calibrate_lambdas(p_home: float, p_draw: float, p_away: float, rho: float =
             loss = (H - p_home)**2 + (D - p_draw)**2 + (A - p_away)**2
             if loss < best[2]: best = (lh, la, loss)
     return best
-def summarize_match(home, away, p_home, p_draw, p_away, rho: float=0.12, totals_lines=None):
+def summarize_match(home, away, p_home, p_draw, p_away, rho: float=0.12, totals_lines=None, prior=None, prior_weight: float=0.0):
     lh, la, loss = calibrate_lambdas(p_home, p_draw, p_away, rho=rho)
+    if prior and prior_weight > 0:  # blend market-implied lambdas with fitted (lambda_home, lambda_away)
+        w = min(max(float(prior_weight), 0.0), 1.0); lh = (1-w)*lh + w*prior[0]; la = (1-w)*la + w*prior[1]
     M = dixon_coles_matrix(lh, la, rho=rho, max_goals=8); H,D,A = hda_from_matrix(M)
     lines = totals_lines or [2.5]; totals = {float(L): over_prob(M, L) for L in lines}
     mean_home = sum(i * M[i,:].sum() for i in range(M.shape[0]))
@@ -0,0 +1,111 @@
+# foot_ratings.py — Dixon-Coles attack/defence + rho fit from a local results history
+# Refit with `python foot_ratings.py` (data/results.csv → data/ratings.json); the workflow runs it before the report.
+from __future__ import annotations
+import os, json, numpy as np, pandas as pd
+
+DATA_DIR = os.environ.get("DATA_DIR","data")
+RESULTS = os.path.join(DATA_DIR, "results.csv")
+RATINGS = os.path.join(DATA_DIR, "ratings.json")
+RESULT_COLS = ["date","home","away","home_goals","away_goals"]
+
+def load_results(path: str = RESULTS) -> pd.DataFrame:
+    """Results history CSV: date,home,away,home_goals,away_goals (team names as in the Odds API)."""
+    if not os.path.exists(path) or os.path.getsize(path)==0: return pd.DataFrame(columns=RESULT_COLS)
+    df = pd.read_csv(path)
+    df = df[RESULT_COLS].dropna().copy()
+    df["date"] = pd.to_datetime(df["date"], utc=True)
+    df["home_goals"] = df["home_goals"].astype(int); df["away_goals"] = df["away_goals"].astype(int)
+    return df
+
+def time_weights(dates: pd.Series, ref=None, half_life_days: float = 180.0) -> np.ndarray:
+    """Exponential time decay exp(-xi * age) with xi = ln2 / half_life."""
+    ref = pd.Timestamp.now(tz="UTC") if ref is None else pd.Timestamp(ref)
+    ref = ref.tz_localize("UTC") if ref.tzinfo is None else ref.tz_convert("UTC")
+    age = (ref - pd.to_datetime(dates, utc=True)).dt.total_seconds().to_numpy() / 86400.0
+    return np.exp(-np.log(2.0) / float(half_life_days) * np.clip(age, 0.0, None))
+
+def _neg_log_lik(theta, hi, ai, hg, ag, w, n_teams, l2):
+    """Weighted negative DC log-likelihood and its gradient, fully vectorized over matches.
+    theta = [attack(n), defence(n), home, rho]; tau follows foot_model.dixon_coles_matrix."""
+    att, dfc = theta[:n_teams], theta[n_teams:2*n_teams]; home, rho = theta[-2], theta[-1]
+    s_h = att[hi] + dfc[ai] + home; s_a = att[ai] + dfc[hi]
+    lam, mu = np.exp(s_h), np.exp(s_a)
+    m00 = (hg==0) & (ag==0); m01 = (hg==0) & (ag==1); m10 = (hg==1) & (ag==0); m11 = (hg==1) & (ag==1)
+    tau = np.ones_like(lam)
+    tau[m00] = 1 - (lam[m00] + mu[m00])*rho + rho
+    tau[m01] = 1 + lam[m01]*rho; tau[m10] = 1 + mu[m10]*rho; tau[m11] = 1 - rho
+    tau = np.clip(tau, 1e-10, None)
+    ll = w * (hg*s_h - lam + ag*s_a - mu + np.log(tau))
+    # d log-lik / d s_h and / d s_a (Poisson part + tau part through lam, mu)
+    g_h = hg - lam; g_a = ag - mu
+    g_h[m00] -= rho*lam[m00]/tau[m00]; g_a[m00] -= rho*mu[m00]/tau[m00]
+    g_h[m01] += rho*lam[m01]/tau[m01]; g_a[m10] += rho*mu[m10]/tau[m10]
+    g_h *= w; g_a *= w
+    g_rho = np.zeros_like(lam)
+    g_rho[m00] = (1 - lam[m00] - mu[m00])/tau[m00]; g_rho[m01] = lam[m01]/tau[m01]
+    g_rho[m10] = mu[m10]/tau[m10]; g_rho[m11] = -1.0/tau[m11]
+    grad = np.empty_like(theta)
+    grad[:n_teams] = np.bincount(hi, g_h, n_teams) + np.bincount(ai, g_a, n_teams) - l2*att
+    grad[n_teams:2*n_teams] = np.bincount(ai, g_h, n_teams) + np.bincount(hi, g_a, n_teams) - l2*dfc
+    grad[-2] = g_h.sum(); grad[-1] = (w*g_rho).sum()
+    nll = -(ll.sum() - 0.5*l2*(att@att + dfc@dfc))
+    return nll, -grad
+
+def fit_ratings(results: pd.DataFrame, prev: dict | None = None, ref=None,
+                half_life_days: float = 180.0, l2: float = 0.01) -> dict | None:
+    """Fit team attack/defence, home advantage and rho. `prev` (a previous fit) warm-starts the solver."""
+    from scipy.optimize import minimize  # only the refit needs scipy; readers of ratings.json don't
+    if results.empty: return None
+    teams = sorted(set(results["home"]) | set(results["away"])); n = len(teams)
+    idx = {t: k for k, t in enumerate(teams)}
+    hi = results["home"].map(idx).to_numpy(); ai = results["away"].map(idx).to_numpy()
+    hg = results["home_goals"].to_numpy(float); ag = results["away_goals"].to_numpy(float)
+    w = time_weights(results["date"], ref=ref, half_life_days=half_life_days)
+    x0 = np.zeros(2*n + 2); x0[-2] = 0.25
+    if prev:
+        for t, k in idx.items():
+            x0[k] = prev["attack"].get(t, 0.0); x0[n+k] = prev["defence"].get(t, 0.0)
+        x0[-2] = prev.get("home", 0.25); x0[-1] = prev.get("rho", 0.0)
+    bounds = [(None, None)]*(2*n + 1) + [(-0.5, 0.5)]
+    res = minimize(_neg_log_lik, x0, args=(hi, ai, hg, ag, w, n, l2), jac=True, method="L-BFGS-B", bounds=bounds)
+    th = res.x
+    return {"attack": dict(zip(teams, th[:n].round(6).tolist())), "defence": dict(zip(teams, th[n:2*n].round(6).tolist())),
+            "home": float(th[-2]), "rho": float(th[-1]), "n_matches": int(len(results)),
+            "half_life_days": float(half_life_days), "converged": bool(res.success),
+            "fitted_at": pd.Timestamp.now(tz="UTC").isoformat()}
+
+def expected_goals(ratings: dict | None, home: str, away: str):
+    """(lambda_home, lambda_away) from fitted ratings, or None if a team is unknown."""
+    if not ratings: return None
+    att, dfc = ratings["attack"], ratings["defence"]
+    if home not in att or away not in att: return None
+    return (float(np.exp(att[home] + dfc[away] + ratings["home"])), float(np.exp(att[away] + dfc[home])))
+
+def usable_ratings(ratings: dict | None, max_age_days: float | None = None) -> dict | None:
+    """The ratings if the fit converged and is at most RATINGS_MAX_AGE_DAYS old, else None (market-only model)."""
+    if not ratings or not ratings.get("converged"): return None
+    max_age = float(os.getenv("RATINGS_MAX_AGE_DAYS","7")) if max_age_days is None else float(max_age_days)
+    fitted = pd.to_datetime(ratings.get("fitted_at"), utc=True, errors="coerce")
+    if pd.isna(fitted) or pd.Timestamp.now(tz="UTC") - fitted > pd.Timedelta(days=max_age): return None
+    return ratings
+
+def load_ratings(path: str = RATINGS) -> dict | None:
+    if not os.path.exists(path) or os.path.getsize(path)==0: return None
+    with open(path, encoding="utf-8") as f: return json.load(f)
+
+def save_ratings(ratings: dict, path: str = RATINGS):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f: json.dump(ratings, f, ensure_ascii=False, indent=1)
+
+def refit(results_path: str = RESULTS, ratings_path: str = RATINGS) -> dict | None:
+    """Daily refit: warm-start from the stored ratings, then overwrite them."""
+    results = load_results(results_path)
+    ratings = fit_ratings(results, prev=load_ratings(ratings_path),
+                          half_life_days=float(os.getenv("RATINGS_HALF_LIFE_DAYS","180")))
+    if ratings: save_ratings(ratings, ratings_path)
+    return ratings
+
+if __name__ == "__main__":
+    r = refit()
+    if not r: raise SystemExit(f"❌ Aucun résultat dans {RESULTS}.")
+    print(f"✅ {len(r['attack'])} équipes, {r['n_matches']} matchs • home={r['home']:.3f} rho={r['rho']:.3f} • converged={r['converged']}")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import pandas as pd, numpy as np
 from foot_model import summarize_match
+from foot_ratings import expected_goals, usable_ratings
 def implied_prob(odds: float): return 1.0/float(odds) if odds>1.0 else 1.0
 def consensus_from_prices(prices):
     imps = sorted([implied_prob(x) for x in prices if x and x>1.0])
@@ -22,14 +23,21 @@ def build_consensus(df_h2h: pd.DataFrame) -> pd.DataFrame:
 def best_price_and_book(df: pd.DataFrame):
     if df.empty: return float("nan"), ""
     idx = df["price"].idxmax(); return float(df.loc[idx,"price"]), str(df.loc[idx,"book"])
-def select_picks(df_all: pd.DataFrame, min_ev: float = 0.02, max_picks: int = 3):
+def summarize_with_ratings(r, ratings: dict | None = None, ratings_weight: float = 0.3):
+    """summarize_match for a consensus row, using the fitted rho and blending fitted lambdas when available.
+    Non-converged or stale fits (see usable_ratings) fall back to the market-only model (rho=0.12)."""
+    ratings = usable_ratings(ratings)
+    rho = float(ratings["rho"]) if ratings else 0.12
+    return summarize_match(r["home"], r["away"], r["p_home"], r["p_draw"], r["p_away"], rho=rho, totals_lines=[2.5],
+                           prior=expected_goals(ratings, r["home"], r["away"]), prior_weight=ratings_weight)
+def select_picks(df_all: pd.DataFrame, min_ev: float = 0.02, max_picks: int = 3, ratings: dict | None = None, ratings_weight: float = 0.3):
     df_h2h = df_all[(df_all["market"]=="h2h") & (df_all["outcome"].isin(["home","draw","away"]))].copy()
     df_tot = df_all[(df_all["market"]=="totals") & (df_all["outcome"].isin(["over","under"]))].copy()
     if "point" in df_tot.columns: df_tot["point"] = pd.to_numeric(df_tot["point"], errors="coerce")
     cons = build_consensus(df_h2h); picks, diags = [], []
     for _, r in cons.iterrows():
         mid = r["match_id"]; g_h2h = df_h2h[df_h2h["match_id"]==mid]; g_tot = df_tot[df_tot["match_id"]==mid]
-        summ = summarize_match(r["home"], r["away"], r["p_home"], r["p_draw"], r["p_away"], rho=0.12, totals_lines=[2.5])
+        summ = summarize_with_ratings(r, ratings, ratings_weight)
         mean_score = f"{summ['mean_home']:.2f}-{summ['mean_away']:.2f}"
         top_scores = ", ".join([f"{i}-{j} {p*100:.1f}%" for i,j,p in summ["top_scores"]])
         out_best = None
@@ -67,14 +75,14 @@ def select_picks(df_all: pd.DataFrame, min_ev: float = 0.02, max_picks: int = 3)
                       "p_over25": float(summ["totals_over"].get(2.5, np.nan)),})
     picks = sorted(picks, key=lambda x: x["ev"], reverse=True)[:max_picks]
     return picks, diags
-def weekend_report(df_all: pd.DataFrame, min_ev: float = 0.01):
+def weekend_report(df_all: pd.DataFrame, min_ev: float = 0.01, ratings: dict | None = None, ratings_weight: float = 0.3):
     df_h2h = df_all[(df_all["market"]=="h2h") & (df_all["outcome"].isin(["home","draw","away"]))].copy()
     df_tot = df_all[(df_all["market"]=="totals") & (df_all["outcome"].isin(["over","under"]))].copy()
     if "point" in df_tot.columns: df_tot["point"] = pd.to_numeric(df_tot["point"], errors="coerce")
     cons = build_consensus(df_h2h); lines_by_league = {}
     for _, r in cons.iterrows():
         mid = r["match_id"]; g_h2h = df_h2h[df_h2h["match_id"]==mid]; g_tot = df_tot[df_tot["match_id"]==mid]
-        summ = summarize_match(r["home"], r["away"], r["p_home"], r["p_draw"], r["p_away"], rho=0.12, totals_lines=[2.5])
+        summ = summarize_with_ratings(r, ratings, ratings_weight)
         mean_score = f"{summ['mean_home']:.2f}-{summ['mean_away']:.2f}"
         hda = f"H/D/A {summ['p_home']*100:.0f}/{summ['p_draw']*100:.0f}/{summ['p_away']*100:.0f}%"
         over25 = summ['totals_over'].get(2.5, np.nan); over_s = f"Over2.5 {over25*100:.0f}%" if not pd.isna(over25) else ""
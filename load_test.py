@@ -0,0 +1,82 @@
+# load_test.py — drive bot.py / cron_send_foot.py / weekend_send.py against stub_server (no credits, no Telegram)
+# python load_test.py --target bot --chats 50 --commands /picks,/weekend
+from __future__ import annotations
+import os, time, argparse, threading, importlib
+import numpy as np
+from stub_server import StubState, start_server
+
+def _pcts(xs):
+    if not xs: return "n/a"
+    a = np.asarray(xs) * 1000.0
+    return f"p50 {np.percentile(a,50):.0f} ms • p95 {np.percentile(a,95):.0f} ms • max {a.max():.0f} ms"
+
+def setup_env(base: str, keys: str):
+    os.environ.update({"ODDS_API_BASE": f"{base}/v4", "TELEGRAM_API_BASE": base, "TELEGRAM_BOT_TOKEN": "stub",
+                       "ODDS_API_KEYS": keys, "ODDS_API_KEY": "", "TELEGRAM_CHAT_ID": os.getenv("LOAD_CHAT_ID","424242")})
+
+def run_bot(state: StubState, chats: int, commands: list, timeout: float) -> dict:
+    """Each command comes from its own chat id, so its reply is the first sendMessage to that chat."""
+    os.environ["TELEGRAM_CHAT_ID"] = ""  # accept every chat id
+    bot = importlib.import_module("bot")
+    threading.Thread(target=bot.main, daemon=True).start()
+    sent_at = {}; t0 = time.time()
+    def chat(i):
+        cid = str(100000 + i); sent_at[cid] = time.time(); state.enqueue(int(cid), commands[i % len(commands)])
+    threads = [threading.Thread(target=chat, args=(i,)) for i in range(chats)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    deadline = t0 + timeout
+    with state.cond:
+        while len({m["chat_id"] for m in state.sent if m["chat_id"] in sent_at}) < chats and time.time() < deadline:
+            state.cond.wait(max(0.0, deadline - time.time()))
+        first = {}
+        for m in state.sent:
+            if m["chat_id"] in sent_at and m["chat_id"] not in first: first[m["chat_id"]] = m["ts"]
+    lat = [first[c] - sent_at[c] for c in first]
+    elapsed = (max(first.values()) - t0) if first else timeout
+    return {"done": len(first), "total": chats, "latency": lat, "elapsed": elapsed}
+
+def run_script(module: str, runs: int, workers: int) -> dict:
+    """Run a one-shot script's main() `runs` times across `workers` threads."""
+    mod = importlib.import_module(module); lat = []; errors = []; lock = threading.Lock(); it = iter(range(runs))
+    def worker():
+        while True:
+            with lock:
+                if next(it, None) is None: return
+            t = time.time()
+            try: mod.main()
+            except Exception as e:
+                with lock: errors.append(repr(e))
+            with lock: lat.append(time.time() - t)
+    t0 = time.time(); threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return {"done": len(lat) - len(errors), "total": runs, "latency": lat, "elapsed": time.time() - t0, "errors": errors}
+
+def main():
+    ap = argparse.ArgumentParser(description="Load test against the local stub server")
+    ap.add_argument("--target", choices=["bot","cron","weekend"], default="bot")
+    ap.add_argument("--chats", type=int, default=20, help="concurrent chats (bot target)")
+    ap.add_argument("--commands", default="/picks,/weekend,/help")
+    ap.add_argument("--runs", type=int, default=10, help="script runs (cron/weekend targets)")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--events", type=int, default=20); ap.add_argument("--books", type=int, default=10)
+    ap.add_argument("--latency-ms", type=float, default=50.0); ap.add_argument("--quota", type=int, default=100000)
+    ap.add_argument("--keys", default="bad;limited;good", help="ODDS_API_KEYS given to the bot (exercises failover)")
+    ap.add_argument("--bad-keys", default="bad"); ap.add_argument("--limited-keys", default="limited")
+    ap.add_argument("--timeout", type=float, default=600.0)
+    a = ap.parse_args()
+    state = StubState(a.events, a.books, a.latency_ms, a.quota, a.bad_keys.split(";"), a.limited_keys.split(";"))
+    srv = start_server(state); base = f"http://127.0.0.1:{srv.server_address[1]}"
+    setup_env(base, a.keys)
+    if a.target == "bot":
+        res = run_bot(state, a.chats, [c.strip() for c in a.commands.split(",") if c.strip()], a.timeout)
+    else:
+        res = run_script({"cron": "cron_send_foot", "weekend": "weekend_send"}[a.target], a.runs, a.workers)
+    srv.shutdown()
+    print(f"🎯 {a.target}: {res['done']}/{res['total']} OK en {res['elapsed']:.1f}s • {res['done']/max(1e-9,res['elapsed']):.2f} cmd/s")
+    print(f"⏱️ Latence: {_pcts(res['latency'])}")
+    print(f"📨 Messages Telegram: {len(state.sent)} • Crédits par clé: {state.used}")
+    for e in res.get("errors", [])[:5]: print("❌", e)
+
+if __name__ == "__main__": main()
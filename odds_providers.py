@@ -2,11 +2,16 @@ from __future__ import annotations
 import os, requests
 import pandas as pd
 
-API_BASE = "https://api.the-odds-api.com/v4"
+API_BASE = os.environ.get("ODDS_API_BASE", "https://api.the-odds-api.com/v4")
 
 class OddsApiError(RuntimeError):
     pass
 
+ODDS_COLUMNS = ["match_id","sport","league","teams","start_time_iso","market","outcome","point","book","price","book_home","book_away"]
+
+# Last x-requests-* headers seen (per key), for callers that budget credits
+LAST_QUOTA = {}
+
 def _iter_api_keys():
     """Yield API keys from env: ODDS_API_KEYS (semicolon-separated) then ODDS_API_KEY."""
     keys = []
@@ -42,6 +47,20 @@ def _handle_response(r, sport_label):
         raise OddsApiError(f"[{sport_label}] Rate limit 429. Remaining={remaining}, Used={used}, Allowed={allowed}")
     raise OddsApiError(f"[{sport_label}] HTTP {r.status_code}: {detail}")
 
+def _record_quota(r, key):
+    remaining = r.headers.get("x-requests-remaining")
+    if remaining is None: return
+    def _num(v):
+        try: return float(v)
+        except (TypeError, ValueError): return None
+    LAST_QUOTA[key] = {"remaining": _num(remaining), "used": _num(r.headers.get("x-requests-used")),
+                       "last": _num(r.headers.get("x-requests-last"))}
+
+def quota_remaining():
+    """Credits left across all keys seen so far (None if no quota headers yet)."""
+    vals = [q["remaining"] for q in LAST_QUOTA.values() if q.get("remaining") is not None]
+    return sum(vals) if vals else None
+
 def _call_endpoint(url, params, sport_label):
     """Try all keys in order until one succeeds."""
     last_err = None
@@ -51,6 +70,7 @@ def _call_endpoint(url, params, sport_label):
         params = dict(params)  # copy
         params["apiKey"] = key
         r = requests.get(url, params=params, timeout=25)
+        _record_quota(r, key)
         if r.status_code == 200:
             return r.json()
         else:
@@ -83,22 +103,33 @@ def _row_totals(mid, league, teams, start, book_key, out, price, pt, home, away)
         "book_home":home,"book_away":away
     }
 
-def fetch_soccer_odds(debug: bool=False) -> pd.DataFrame:
+def wanted_sports():
+    """Leagues from ODDS_SPORTS (comma-separated), defaulting to the top-5."""
+    sports_env = os.environ.get("ODDS_SPORTS")
+    if sports_env:
+        return [s.strip() for s in sports_env.split(",") if s.strip()]
+    return ["soccer_epl","soccer_france_ligue_1","soccer_spain_la_liga","soccer_italy_serie_a","soccer_germany_bundesliga"]
+
+def fetch_events(sport: str) -> list:
+    """List upcoming events (id, teams, commence_time) for one league via /sports/{sport}/events.
+       The events endpoint does not consume odds credits."""
+    url = f"{API_BASE}/sports/{sport}/events"
+    return _call_endpoint(url, {"dateFormat": os.environ.get("ODDS_DATE_FORMAT", "iso")}, sport)
+
+def fetch_soccer_odds(debug: bool=False, sports=None, use_upcoming=None) -> pd.DataFrame:
     """Fetch odds for soccer using one of two modes:
        - Default (efficient): if ODDS_USE_UPCOMING="1", call /sports/upcoming/odds ONCE then filter by leagues
        - Classic: loop over each league in ODDS_SPORTS and call /sports/{league}/odds (more requests)
+       Passing `sports` restricts the fetch to those leagues; `use_upcoming` overrides ODDS_USE_UPCOMING.
        Supports multi-key failover via ODDS_API_KEYS="key1;key2" (tries next key on 401/403/429).
     """
     regions = os.environ.get("ODDS_REGIONS", "eu,uk")
     odds_format = os.environ.get("ODDS_FORMAT", "decimal")
     date_format = os.environ.get("ODDS_DATE_FORMAT", "iso")
-    use_upcoming = os.environ.get("ODDS_USE_UPCOMING","1") == "1"
+    if use_upcoming is None:
+        use_upcoming = os.environ.get("ODDS_USE_UPCOMING","1") == "1"
 
-    sports_env = os.environ.get("ODDS_SPORTS")
-    if sports_env:
-        wanted = [s.strip() for s in sports_env.split(",") if s.strip()]
-    else:
-        wanted = ["soccer_epl","soccer_france_ligue_1","soccer_spain_la_liga","soccer_italy_serie_a","soccer_germany_bundesliga"]
+    wanted = list(sports) if sports is not None else wanted_sports()
 
     rows = []
     if use_upcoming:
@@ -186,5 +217,4 @@ def fetch_soccer_odds(debug: bool=False) -> pd.DataFrame:
         if debug:
             print("DEBUG per-sport counts:", counts)
 
-    cols = ["match_id","sport","league","teams","start_time_iso","market","outcome","point","book","price","book_home","book_away"]
-    return pd.DataFrame(rows, columns=cols)
+    return pd.DataFrame(rows, columns=ODDS_COLUMNS)
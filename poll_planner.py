@@ -0,0 +1,165 @@
+# poll_planner.py — kickoff-aware odds polling: refresh leagues more often near kickoff, within a credit budget
+# - fetch_planned_odds(): drop-in for fetch_soccer_odds() (senders opt in with ODDS_USE_PLANNER=1). Each call
+#   refreshes only the leagues whose odds are stale for their time-to-kickoff, serves the rest from
+#   DATA_DIR/odds_cache.csv, and never spends more than the paced credit budget. It only decides what to fetch
+#   *when it is called*: under the fixed cron workflow it saves credits but cannot poll more often.
+# - python poll_planner.py --loop: daemon that sleeps until the next league is due and refreshes the cache,
+#   which is what actually polls more often close to kickoff.
+# State (kickoff index, last refresh, credits spent) lives in DATA_DIR/planner_state.json and must persist.
+from __future__ import annotations
+import os, sys, json, time, pandas as pd
+from odds_providers import fetch_events, fetch_soccer_odds, wanted_sports, quota_remaining, OddsApiError, ODDS_COLUMNS
+
+DATA_DIR = os.environ.get("DATA_DIR","data")
+STATE = os.path.join(DATA_DIR, "planner_state.json")
+ODDS_CACHE = os.path.join(DATA_DIR, "odds_cache.csv")
+
+# (minutes to next kickoff, refresh interval in minutes); beyond the last tier the league is skipped
+REFRESH_TIERS = [(60, 10), (6*60, 30), (24*60, 120), (72*60, 360)]
+
+def refresh_interval(minutes_to_kickoff: float):
+    for horizon, every in REFRESH_TIERS:
+        if minutes_to_kickoff <= horizon: return every
+    return None
+
+def credits_per_call() -> int:
+    """The Odds API bills markets x regions per odds call (h2h,totals = 2 markets), per league or upcoming."""
+    regions = [r for r in os.environ.get("ODDS_REGIONS", "eu,uk").split(",") if r.strip()]
+    return 2 * max(1, len(regions))
+
+def load_state(path: str = STATE) -> dict:
+    st = {}
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, encoding="utf-8") as f: st = json.load(f)
+    for k in ("kickoffs", "index_ts", "last_odds", "spent"): st.setdefault(k, {})
+    return st
+
+def save_state(st: dict, path: str = STATE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f: json.dump(st, f, indent=1)
+
+def refresh_index(st: dict, leagues, now: pd.Timestamp, max_age_h: float = 6.0) -> list:
+    """Update the per-league kickoff index from the (credit-free) events listing when stale.
+    Returns the OddsApiError of each league whose listing failed (its previous index is kept)."""
+    errors = []
+    for lg in leagues:
+        ts = st["index_ts"].get(lg)
+        if ts and now - pd.Timestamp(ts) < pd.Timedelta(hours=max_age_h): continue
+        try: events = fetch_events(lg)
+        except OddsApiError as e:
+            errors.append(e); continue
+        st["kickoffs"][lg] = sorted(e["commence_time"] for e in events if e.get("commence_time"))
+        st["index_ts"][lg] = now.isoformat()
+    return errors
+
+def _schedule(st: dict, leagues, now: pd.Timestamp, min_start_min: float = 0.0) -> dict:
+    """{league: (next refresh time, refresh interval)} for leagues with a kickoff inside the last tier."""
+    out = {}
+    for lg in leagues:
+        ko = [pd.Timestamp(k) for k in st["kickoffs"].get(lg, [])]
+        ko = [k for k in ko if k >= now + pd.Timedelta(minutes=min_start_min)]
+        if not ko: continue
+        every = refresh_interval((min(ko) - now).total_seconds() / 60.0)
+        if every is None: continue
+        last = st["last_odds"].get(lg)
+        out[lg] = (pd.Timestamp(last) + pd.Timedelta(minutes=every) if last else now, every)
+    return out
+
+def plan(st: dict, leagues, now: pd.Timestamp, min_start_min: float = 0.0) -> list:
+    """Leagues due for a refresh now, most overdue (relative to their interval) first."""
+    due = [((now - nxt).total_seconds() / 60.0 / every, lg)
+           for lg, (nxt, every) in _schedule(st, leagues, now, min_start_min).items() if nxt <= now]
+    return [lg for _, lg in sorted(due, reverse=True)]
+
+def next_refresh_at(st: dict, leagues, now: pd.Timestamp, min_start_min: float = 0.0):
+    sched = _schedule(st, leagues, now, min_start_min)
+    return min(nxt for nxt, _ in sched.values()) if sched else None
+
+def _days_to_reset(now: pd.Timestamp) -> int:
+    """Days left (today included) before the monthly quota resets on ODDS_QUOTA_RESET_DAY."""
+    day = int(os.getenv("ODDS_QUOTA_RESET_DAY","1")); today = now.normalize()
+    reset = today.replace(day=min(day, today.days_in_month))
+    if reset <= today:
+        nxt = today + pd.offsets.MonthBegin(1); reset = nxt.replace(day=min(day, nxt.days_in_month))
+    return max(1, (reset - today).days)
+
+def credit_budget(st: dict, now: pd.Timestamp) -> float | None:
+    """Credits usable now. ODDS_DAILY_BUDGET caps today's spend; when unset, the credits above
+    ODDS_CREDIT_RESERVE are paced evenly over the days left before the quota resets."""
+    reserve = float(os.getenv("ODDS_CREDIT_RESERVE","20")); daily = os.getenv("ODDS_DAILY_BUDGET")
+    spent_today = st["spent"].get(now.strftime("%Y-%m-%d"), 0)
+    remaining = quota_remaining()
+    if remaining is None: remaining = st.get("remaining")
+    if remaining is None: return float(daily) - spent_today if daily else None
+    available = remaining - reserve
+    if daily: allowance = float(daily) - spent_today
+    else: allowance = (available + spent_today) / _days_to_reset(now) - spent_today
+    return min(available, allowance)
+
+def _load_cache(path: str = ODDS_CACHE) -> pd.DataFrame:
+    if not os.path.exists(path) or os.path.getsize(path) == 0: return pd.DataFrame(columns=ODDS_COLUMNS)
+    return pd.read_csv(path)
+
+def fetch_planned_odds(now=None, debug: bool = False) -> pd.DataFrame:
+    """Drop-in for fetch_soccer_odds(): refreshes only due leagues and serves the rest from the local cache.
+    With ODDS_USE_UPCOMING=1 a refresh is one /sports/upcoming/odds call (same cost as one league), so it is
+    used whenever at least one league is due; otherwise due leagues are fetched one call each.
+    Raises OddsApiError when nothing can be served: every kickoff listing failed, or the credit budget
+    allows no call, and the cache is empty. Leagues left stale by the budget are in `.attrs["stale_leagues"]`."""
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    now = now.tz_localize("UTC") if now.tzinfo is None else now.tz_convert("UTC")
+    st = load_state(); leagues = wanted_sports(); cost = credits_per_call()
+    min_start = float(os.getenv("MIN_START_MINUTES","0"))
+    errors = refresh_index(st, leagues, now, max_age_h=float(os.getenv("PLANNER_INDEX_MAX_AGE_H","6")))
+    if quota_remaining() is not None: st["remaining"] = quota_remaining()
+    cache = _load_cache()
+    # no kickoff index at all and nothing cached: surface the API error (bad key, quota) like fetch_soccer_odds
+    if errors and cache.empty and not any(st["kickoffs"].get(lg) for lg in leagues):
+        save_state(st); raise errors[-1]
+    due = plan(st, leagues, now, min_start); budget = credit_budget(st, now)
+    upcoming = os.environ.get("ODDS_USE_UPCOMING","1") == "1" and bool(due)
+    if upcoming: n_calls = 1 if budget is None or budget >= cost else 0
+    else:
+        n_calls = len(due) if budget is None else min(len(due), max(0, int(budget // cost)))
+    if due and not n_calls and cache.empty:
+        save_state(st); raise OddsApiError(f"Budget de crédits atteint ({budget:.0f} < {cost} par appel) et aucun cache de cotes.")
+    stale = [] if upcoming and n_calls else due[n_calls:]
+    if not upcoming: due = due[:n_calls]
+    if due and n_calls:
+        fresh = fetch_soccer_odds(debug=debug, sports=leagues if upcoming else due, use_upcoming=upcoming)
+        # one upcoming call refreshes every wanted league it returned, not only the due ones
+        refreshed = set(due) | set(fresh["league"].unique())
+        cache = pd.concat([cache[~cache["league"].isin(refreshed)], fresh], ignore_index=True)
+        day = now.strftime("%Y-%m-%d"); st["spent"] = {day: st["spent"].get(day, 0) + cost * n_calls}
+        for lg in refreshed: st["last_odds"][lg] = now.isoformat()
+        if quota_remaining() is not None: st["remaining"] = quota_remaining()
+    else:
+        refreshed = set()
+    cache = cache[cache["league"].isin(leagues) & (pd.to_datetime(cache["start_time_iso"], utc=True) > now)]
+    os.makedirs(DATA_DIR, exist_ok=True); cache.to_csv(ODDS_CACHE, index=False)
+    save_state(st)
+    if debug: print(f"DEBUG planner due={due} refreshed={sorted(refreshed)} stale={stale} calls={n_calls if due else 0} "
+                    f"budget={budget} cached_rows={len(cache)} remaining={st.get('remaining')}")
+    out = cache.reset_index(drop=True)
+    out.attrs["stale_leagues"] = stale  # due but not refreshed for lack of credits (served from cache)
+    return out
+
+def run_loop(debug: bool = False):
+    """Keep the odds cache fresh: refresh what is due, then sleep until the next league is due
+    (at least 1 min, at most PLANNER_MAX_SLEEP_MIN so the kickoff index is re-read)."""
+    max_sleep = 60.0 * float(os.getenv("PLANNER_MAX_SLEEP_MIN","30"))
+    while True:
+        try: fetch_planned_odds(debug=debug)
+        except OddsApiError as e: print(f"⚠️ The Odds API: {e}")
+        now = pd.Timestamp.now(tz="UTC"); nxt = next_refresh_at(load_state(), wanted_sports(), now)
+        wait = max_sleep if nxt is None else (nxt - now).total_seconds()
+        time.sleep(min(max(wait, 60.0), max_sleep))
+
+if __name__ == "__main__":
+    if "--loop" in sys.argv: run_loop(debug="--debug" in sys.argv)
+    now = pd.Timestamp.now(tz="UTC"); st = load_state(); leagues = wanted_sports()
+    refresh_index(st, leagues, now); save_state(st)
+    for lg in leagues:
+        ko = [k for k in st["kickoffs"].get(lg, []) if pd.Timestamp(k) > now]
+        print(f"{lg}: {len(ko)} matchs à venir • prochain {ko[0] if ko else '—'}")
+    print("À rafraîchir maintenant:", plan(st, leagues, now) or "aucune ligue", f"• budget {credit_budget(st, now)}")
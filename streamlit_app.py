@@ -1,5 +1,6 @@
 import os, pandas as pd, numpy as np, datetime as dt, pytz, matplotlib.pyplot as plt
 import streamlit as st
+from bankroll_sim import bets_from_journal, kelly_fractions, simulate_paths, summarize_paths
 
 DATA_DIR = os.environ.get("DATA_DIR","data")
 JOURNAL = os.path.join(DATA_DIR, "journal.csv")
@@ -77,3 +78,57 @@ if not settled.empty:
     colE.metric("Edge moyen", f"{avg_edge*100:.2f}%")
 else:
     st.info("Aucune ligne soldée.")
+
+st.subheader("🎲 Simulation Monte Carlo de bankroll")
+
+@st.cache_data(max_entries=16, show_spinner="Simulation en cours…")
+def _simulate(journal_version, _journal, sizing, fraction, n_paths, bk0, ruin_frac):
+    # _journal is not hashed: the cache key is the journal version (mtime, size) + parameters
+    bets = bets_from_journal(_journal)
+    if bets.empty: return None
+    if sizing == "kelly":
+        sim = simulate_paths(bets["odds"], bets["prob"], bk0, n_paths, fractions=kelly_fractions(bets["odds"], bets["prob"], fraction), ruin_frac=ruin_frac)
+    else:
+        bets = bets[bets["stake"] > 0]
+        if bets.empty: return "no_stakes"
+        sim = simulate_paths(bets["odds"], bets["prob"], bk0, n_paths, stakes=bets["stake"], ruin_frac=ruin_frac)
+    return len(bets), sim, summarize_paths(sim, bk0)
+
+colS1, colS2, colS3, colS4, colS5 = st.columns(5)
+with colS1:
+    sizing_label = st.selectbox("Mise", ["Mises du journal", "Kelly fractionnel"], index=0)
+with colS2:
+    kelly_frac = st.number_input("Fraction Kelly", min_value=0.01, max_value=1.0, value=0.20, step=0.05)
+with colS3:
+    n_paths = int(st.number_input("Trajectoires", min_value=1000, max_value=1_000_000, value=100_000, step=10_000))
+with colS4:
+    # same starting bankroll as the equity curve: journal stakes are absolute amounts
+    bk_hist = df.sort_values("timestamp_iso")["bankroll_before"].dropna() if "bankroll_before" in df.columns else pd.Series(dtype=float)
+    sim_bk0 = st.number_input("Bankroll initiale", min_value=1.0, value=max(1.0, float(bk_hist.iloc[0])) if not bk_hist.empty else 100.0, step=10.0)
+with colS5:
+    ruin_pct = st.number_input("Seuil de ruine (% bankroll)", min_value=0.0, max_value=99.0, value=50.0, step=5.0)
+
+journal_version = (os.path.getmtime(JOURNAL), os.path.getsize(JOURNAL))
+res = _simulate(journal_version, df, "kelly" if sizing_label.startswith("Kelly") else "journal",
+                float(kelly_frac), n_paths, float(sim_bk0), float(ruin_pct) / 100.0)
+if res is None:
+    st.info("Pas de cote/probabilité exploitable dans le journal pour simuler.")
+elif res == "no_stakes":
+    st.info("Aucune mise renseignée dans le journal : choisissez « Kelly fractionnel » pour simuler.")
+else:
+    n_bets, sim, summ = res
+    colM1, colM2, colM3, colM4 = st.columns(4)
+    colM1.metric("Paris simulés", n_bets)
+    if sizing_label.startswith("Kelly") and ruin_pct <= 0:
+        colM2.metric("Risque de ruine", "—", help="En Kelly la bankroll ne tombe jamais à 0 : fixez un seuil > 0%.")
+    else:
+        colM2.metric(f"Risque de ruine (≤ {ruin_pct:.0f}%)", f"{summ['risk_of_ruin']*100:.2f}%")
+    colM3.metric("P(perte)", f"{summ['p_loss']*100:.1f}%")
+    colM4.metric("ROI médian", f"{summ['roi'][50]*100:.1f}%")
+    st.dataframe(pd.DataFrame({"Bankroll finale": summ["final"], "Drawdown max (%)": {k: v*100 for k, v in summ["max_dd"].items()},
+                               "ROI (%)": {k: v*100 for k, v in summ["roi"].items()}}).rename_axis("Percentile"))
+    fig, ax = plt.subplots()
+    ax.hist(sim["roi"] * 100, bins=80)  # no style/colors specified per policy
+    ax.set_xlabel("ROI (%)")
+    ax.set_ylabel("Trajectoires")
+    st.pyplot(fig)
@@ -0,0 +1,156 @@
+# stub_server.py — local stand-in for The Odds API (v4) and the Telegram Bot API (load/e2e testing)
+# Point the bot at it with ODDS_API_BASE=http://127.0.0.1:8765/v4 and TELEGRAM_API_BASE=http://127.0.0.1:8765
+from __future__ import annotations
+import os, json, time, random, threading, argparse, datetime as dt
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+LEAGUES = ["soccer_epl","soccer_france_ligue_1","soccer_spain_la_liga","soccer_italy_serie_a","soccer_germany_bundesliga"]
+BOOKS = ["pinnacle","bet365","unibet_eu","betclic","winamax_fr","williamhill","marathonbet","betfair_ex_eu","sport888","betsson",
+         "nordicbet","coolbet","matchbook","onexbet","tipico_de","leovegas","mybookieag","everygame","sportsbet","betway"]
+
+def _odds(p: float, margin: float, rnd: random.Random) -> float:
+    # fair probability + the book's margin, then ±1.5% price noise between books
+    return round(max(1.01, 1.0 / (p * (1 + margin)) * rnd.uniform(0.985, 1.015)), 2)
+
+def make_events(sport: str, n_events: int, n_books: int, seed: int = 0, now=None) -> list:
+    """Deterministic /sports/{sport}/odds payload: h2h + totals (1.5/2.5/3.5) for n_books books per event."""
+    rnd = random.Random(f"{seed}:{sport}"); now = now or dt.datetime.now(dt.timezone.utc)
+    events = []
+    for k in range(n_events):
+        home, away = f"{sport[7:]} Home {k}", f"{sport[7:]} Away {k}"
+        start = (now + dt.timedelta(hours=2 + k * 168.0 / max(1, n_events))).replace(minute=0, second=0, microsecond=0)
+        # fair probabilities are drawn once per event and line; books only differ by margin and noise
+        ph = rnd.uniform(0.25, 0.60); pd_ = rnd.uniform(0.22, 0.30); pa = max(0.05, 1 - ph - pd_)
+        shift = rnd.uniform(-0.08, 0.08); lines = [(pt, min(0.95, max(0.05, po + shift))) for pt, po in ((1.5, 0.75), (2.5, 0.52), (3.5, 0.30))]
+        bms = []
+        for b in BOOKS[:n_books]:
+            m = rnd.uniform(0.03, 0.06)
+            totals = []
+            for pt, po in lines:
+                totals += [{"name":"Over","price":_odds(po, m, rnd),"point":pt}, {"name":"Under","price":_odds(1-po, m, rnd),"point":pt}]
+            bms.append({"key": b, "title": b, "last_update": now.isoformat().replace("+00:00","Z"), "markets": [
+                {"key":"h2h","outcomes":[{"name":home,"price":_odds(ph, m, rnd)},{"name":away,"price":_odds(pa, m, rnd)},{"name":"Draw","price":_odds(pd_, m, rnd)}]},
+                {"key":"totals","outcomes":totals}]})
+        events.append({"id": f"{sport}-{k}", "sport_key": sport, "sport_title": sport, "commence_time": start.isoformat().replace("+00:00","Z"),
+                       "home_team": home, "away_team": away, "bookmakers": bms})
+    return events
+
+class StubState:
+    """Shared state: per-key quota, Telegram update queue and sent messages."""
+    def __init__(self, events=20, books=10, latency_ms=0.0, quota=500, bad_keys=(), limited_keys=(), seed=0):
+        self.events, self.books, self.latency = int(events), int(books), float(latency_ms) / 1000.0
+        self.quota, self.bad_keys, self.limited_keys, self.seed = int(quota), set(bad_keys), set(limited_keys), seed
+        self.used = {}; self.updates = []; self.sent = []; self.next_update_id = 1
+        self.lock = threading.Lock(); self.cond = threading.Condition(self.lock)
+        self._cache = {}
+
+    def payload(self, sport: str) -> bytes:
+        # Payloads are built once per league; the stub must not be the bottleneck under load.
+        if sport not in self._cache:
+            if sport == "upcoming": evs = [e for lg in LEAGUES for e in make_events(lg, self.events, self.books, self.seed)]
+            else: evs = make_events(sport, self.events, self.books, self.seed)
+            self._cache[sport] = (json.dumps(evs).encode(), json.dumps([{k: v for k, v in e.items() if k != "bookmakers"} for e in evs]).encode())
+        return self._cache[sport]
+
+    def enqueue(self, chat_id, text: str) -> int:
+        with self.cond:
+            uid = self.next_update_id; self.next_update_id += 1
+            self.updates.append({"update_id": uid, "message": {"message_id": uid, "date": int(time.time()),
+                                 "chat": {"id": chat_id, "type": "private"}, "text": text}})
+            self.cond.notify_all(); return uid
+
+    def get_updates(self, offset: int, timeout: float) -> list:
+        deadline = time.time() + timeout
+        with self.cond:
+            if offset: self.updates = [u for u in self.updates if u["update_id"] >= offset]
+            while not self.updates and time.time() < deadline:
+                self.cond.wait(deadline - time.time())
+            return list(self.updates[:100])
+
+    def record_sent(self, chat_id, text: str):
+        with self.cond:
+            self.sent.append({"chat_id": str(chat_id), "text": text, "ts": time.time()}); self.cond.notify_all()
+
+class StubHandler(BaseHTTPRequestHandler):
+    state: StubState = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args): pass
+
+    def _reply(self, code: int, body: bytes, headers: dict | None = None):
+        self.send_response(code); self.send_header("Content-Type", "application/json"); self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items(): self.send_header(k, str(v))
+        self.end_headers(); self.wfile.write(body)
+
+    def _json(self, code: int, obj, headers: dict | None = None): self._reply(code, json.dumps(obj).encode(), headers)
+
+    def _form(self) -> dict:
+        n = int(self.headers.get("Content-Length") or 0); raw = self.rfile.read(n).decode() if n else ""
+        if "json" in (self.headers.get("Content-Type") or ""): return json.loads(raw or "{}")
+        return {k: v[0] for k, v in parse_qs(raw).items()}
+
+    def _odds(self, parts: list, qs: dict):
+        st = self.state; key = qs.get("apiKey", [""])[0]
+        if st.latency: time.sleep(st.latency)
+        # The Odds API bills markets x regions per odds call; event listings are free.
+        is_events = parts[-1] == "events"
+        cost = 0 if is_events else len(qs.get("markets", ["h2h"])[0].split(",")) * len(qs.get("regions", ["eu"])[0].split(","))
+        if not key or key in st.bad_keys:
+            return self._json(401, {"message": "API key is not valid or has been disabled.", "error_code": "INVALID_KEY"})
+        with st.lock:
+            used = st.used.get(key, 0)
+            if key in st.limited_keys or used + cost > st.quota:
+                remaining = max(0, st.quota - used); limited = True
+            else:
+                st.used[key] = used = used + cost; remaining = st.quota - used; limited = False
+        quota = {"x-requests-remaining": remaining, "x-requests-used": used, "x-requests-last": cost}
+        if limited:
+            return self._json(429, {"message": "Usage quota has been reached.", "error_code": "OUT_OF_USAGE_CREDITS"}, quota)
+        odds_body, events_body = st.payload(parts[2])
+        self._reply(200, events_body if is_events else odds_body, quota)
+
+    def do_GET(self):
+        u = urlparse(self.path); parts = [p for p in u.path.split("/") if p]; qs = parse_qs(u.query)
+        if len(parts) == 4 and parts[:2] == ["v4","sports"] and parts[3] in ("odds","events"): return self._odds(parts, qs)
+        if len(parts) == 2 and parts[0].startswith("bot") and parts[1] == "getUpdates":
+            res = self.state.get_updates(int(qs.get("offset", ["0"])[0]), min(float(qs.get("timeout", ["0"])[0]), 5.0))
+            return self._json(200, {"ok": True, "result": res})
+        if parts == ["_stub","sent"]: return self._json(200, self.state.sent)
+        self._json(404, {"message": "Unknown endpoint"})
+
+    def do_POST(self):
+        u = urlparse(self.path); parts = [p for p in u.path.split("/") if p]; data = self._form()
+        if len(parts) == 2 and parts[0].startswith("bot") and parts[1] == "sendMessage":
+            self.state.record_sent(data.get("chat_id"), data.get("text", ""))
+            return self._json(200, {"ok": True, "result": {"message_id": len(self.state.sent), "chat": {"id": data.get("chat_id")}, "text": data.get("text", "")}})
+        if parts == ["_stub","updates"]:
+            return self._json(200, {"update_id": self.state.enqueue(data.get("chat_id"), data.get("text", ""))})
+        self._json(404, {"message": "Unknown endpoint"})
+
+def start_server(state: StubState, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub in a daemon thread; port=0 picks a free port (see server.server_address)."""
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    srv = ThreadingHTTPServer((host, port), handler); srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+def _keys(s: str): return [k.strip() for k in (s or "").split(";") if k.strip()]
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Stand-in Odds API + Telegram server")
+    ap.add_argument("--port", type=int, default=int(os.getenv("STUB_PORT","8765")))
+    ap.add_argument("--events", type=int, default=20, help="events per league")
+    ap.add_argument("--books", type=int, default=10, help="bookmakers per event (max %d)" % len(BOOKS))
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--quota", type=int, default=500, help="credits per API key")
+    ap.add_argument("--bad-keys", default="", help="keys answered with 401 (';'-separated)")
+    ap.add_argument("--limited-keys", default="", help="keys answered with 429 (';'-separated)")
+    a = ap.parse_args()
+    st = StubState(a.events, a.books, a.latency_ms, a.quota, _keys(a.bad_keys), _keys(a.limited_keys))
+    srv = start_server(st, port=a.port); base = f"http://{srv.server_address[0]}:{srv.server_address[1]}"
+    print(f"✅ Stub prêt • ODDS_API_BASE={base}/v4 • TELEGRAM_API_BASE={base}")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -2,14 +2,15 @@
 import os, math, pandas as pd, pytz, requests
 from datetime import timedelta
 from odds_providers import fetch_soccer_odds, OddsApiError
-from foot_model import summarize_match
-from foot_selector import build_consensus, best_price_and_book
+from poll_planner import fetch_planned_odds
+from foot_ratings import load_ratings
+from foot_selector import build_consensus, best_price_and_book, summarize_with_ratings
 
 WEEKDAY_FR = ["Lun","Mar","Mer","Jeu","Ven","Sam","Dim"]
 MONTH_FR   = ["janv.","févr.","mars","avr.","mai","juin","juil.","août","sept.","oct.","nov.","déc."]
 
 def send_long_message(chat_id: str, text: str):
-    token = os.environ["TELEGRAM_BOT_TOKEN"]; url = f"https://api.telegram.org/bot{token}/sendMessage"
+    token = os.environ["TELEGRAM_BOT_TOKEN"]; url = f"{os.getenv('TELEGRAM_API_BASE','https://api.telegram.org')}/bot{token}/sendMessage"
     CHUNK = 3500
     for i in range(0, len(text), CHUNK):
         part = text[i:i+CHUNK]
@@ -34,10 +35,11 @@ def main():
     now_paris = pd.Timestamp.now(tz)
     min_ev = float(os.getenv("WEEKEND_MIN_EV","0.01"))
     chat_id = os.environ["TELEGRAM_CHAT_ID"]
+    ratings = load_ratings(); ratings_weight = float(os.getenv("RATINGS_WEIGHT","0.3"))
 
     # fetch odds with error handling + single-call upcoming mode (see odds_providers)
     try:
-        df = fetch_soccer_odds()
+        df = fetch_planned_odds() if os.getenv("ODDS_USE_PLANNER") == "1" else fetch_soccer_odds()
     except OddsApiError as e:
         msg = f"<b>📣 Foot — Rapport week‑end</b>\n⚠️ The Odds API: {str(e)}"
         send_long_message(chat_id, msg)
@@ -80,7 +82,7 @@ def main():
             current_day = start; parts.append("\n" + fmt_day_header(start))
 
         g_h2h = df_h2h[df_h2h['match_id']==mid]; g_tot = df_tot[df_tot['match_id']==mid]
-        summ = summarize_match(r['home'], r['away'], r['p_home'], r['p_draw'], r['p_away'], rho=0.12, totals_lines=[2.5])
+        summ = summarize_with_ratings(r, ratings, ratings_weight)
         mean_score = f"{summ['mean_home']:.2f}-{summ['mean_away']:.2f}"
         hda = f"{summ['p_home']*100:.0f}/{summ['p_draw']*100:.0f}/{summ['p_away']*100:.0f}%"
         p_over = summ['totals_over'].get(2.5, float('nan')); over_s = (f"{p_over*100:.0f}%" if not math.isnan(p_over) else "—")